@@ -6,31 +6,146 @@ Aggregate results from all completed combinations into a single CSV dataset.
 import argparse
 import csv
 import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 RESULTS_DIR = REPO_ROOT / "dataset_results"
+RESULTS_JSONL = REPO_ROOT / "dataset_results.jsonl"
 OUTPUT_CSV = REPO_ROOT / "dataset_results.csv"
 
+_KNOB_RE = re.compile(r"([A-Z][A-Z0-9_]*)=([^;]*)")
+
 def load_metrics(combo_dir):
-    """Load metrics.json from a combination directory."""
-    metrics_file = combo_dir / "metrics.json"
-    if not metrics_file.exists():
+    """Load metrics.json from a combination directory (os.DirEntry)."""
+    try:
+        with open(os.path.join(combo_dir.path, "metrics.json"), "rb") as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
         return None
-    
-    with open(metrics_file) as f:
-        return json.load(f)
 
 def parse_afl_knobs(knobs_str):
     """Parse AFL knobs string into individual values."""
     # Format: "AFL_FAST_CAL=0;AFL_NO_ARITH=1;..."
-    knobs = {}
-    for pair in knobs_str.split(";"):
-        if "=" in pair:
-            key, value = pair.split("=", 1)
-            knobs[key.strip()] = value.strip()
-    return knobs
+    return dict(_KNOB_RE.findall(knobs_str))
+
+def build_row(combo_id, metrics):
+    """Build one CSV row from a combination's metrics dict."""
+    # Extract AFL knob values
+    knobs_str = metrics.get("afl_knobs", "")
+    knobs = parse_afl_knobs(knobs_str)
+    
+    # Build result row
+    row = {
+        "combo_id": combo_id,
+        "AFL_FAST_CAL": knobs.get("AFL_FAST_CAL", "?"),
+        "AFL_NO_ARITH": knobs.get("AFL_NO_ARITH", "?"),
+        "AFL_NO_HAVOC": knobs.get("AFL_NO_HAVOC", "?"),
+        "AFL_DISABLE_TRIM": knobs.get("AFL_DISABLE_TRIM", "?"),
+        "AFL_SHUFFLE_QUEUE": knobs.get("AFL_SHUFFLE_QUEUE", "?"),
+        "bitmap_cvg_pct": metrics.get("bitmap_cvg_pct", 0),
+        "paths_total": metrics.get("paths_total", 0),
+        "execs_done": metrics.get("execs_done", 0),
+        "execs_per_sec": metrics.get("execs_per_sec", 0),
+        "bugs_triggered": metrics.get("bugs_triggered", 0),
+        "bugs_reached": metrics.get("bugs_reached", 0),
+    }
+    return row
+
+def process_combo(combo_dir):
+    """Build one CSV row from a combination directory, or None if it has no metrics."""
+    metrics = load_metrics(combo_dir)
+    if not metrics:
+        print(f"Warning: No metrics.json found in {combo_dir.name}")
+        return None
+    return build_row(combo_dir.name, metrics)
+
+def load_results_jsonl(path):
+    """Read dataset_results.jsonl in one sequential pass. Returns label -> metrics (last entry per label wins)."""
+    by_label = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            metrics = _json_loads(line)
+            label = metrics.get("label")
+            if label:
+                by_label[label] = metrics
+    return by_label
+
+def scan_combo_dirs():
+    """Return combo_* directory entries under RESULTS_DIR, sorted by name."""
+    # os.scandir reuses d_type from the directory listing, so no per-entry stat
+    return sorted(
+        (e for e in os.scandir(RESULTS_DIR) if e.name.startswith("combo_") and e.is_dir(follow_symlinks=False)),
+        key=lambda e: e.name,
+    )
+
+def read_combo_rows(combo_dirs):
+    """Build rows from each directory's metrics.json, skipping directories without one."""
+    if not combo_dirs:
+        return []
+    # I/O-bound: overlap metrics.json reads across combos
+    with ThreadPoolExecutor(max_workers=min(32, len(combo_dirs))) as executor:
+        return [row for row in executor.map(process_combo, combo_dirs) if row is not None]
+
+def collect_from_dirs():
+    """Build rows by scanning combo_* directories under RESULTS_DIR. Returns None if none exist."""
+    combo_dirs = scan_combo_dirs()
+    if not combo_dirs:
+        return None
+    return read_combo_rows(combo_dirs)
+
+def collect_from_jsonl():
+    """
+    Build rows from RESULTS_JSONL, falling back to combo_*/metrics.json for any combo the JSONL
+    is missing (e.g. results from before it existed) or whose metrics.json was rewritten after
+    its JSONL line was recorded (e.g. a manual run_knob_campaign.sh re-run).
+    """
+    by_label = load_results_jsonl(RESULTS_JSONL)
+    combo_dirs = scan_combo_dirs() if RESULTS_DIR.exists() else []
+    
+    missing, stale = [], []
+    for entry in combo_dirs:
+        if entry.name not in by_label:
+            missing.append(entry)
+            continue
+        try:
+            # Lines without recorded_at predate the timestamp, so metrics.json wins for them
+            recorded_at = by_label[entry.name].get("recorded_at", 0)
+            if os.stat(os.path.join(entry.path, "metrics.json")).st_mtime > recorded_at:
+                stale.append(entry)
+        except FileNotFoundError:
+            pass
+    if missing:
+        print(f"Warning: {len(missing)} combination(s) not in {RESULTS_JSONL.name}, reading metrics.json: "
+              + ", ".join(e.name for e in missing))
+    if stale:
+        print(f"Warning: {len(stale)} metrics.json newer than their {RESULTS_JSONL.name} line, using metrics.json: "
+              + ", ".join(e.name for e in stale))
+    dir_names = {e.name for e in combo_dirs}
+    orphans = sorted(label for label in by_label if label not in dir_names)
+    if orphans and combo_dirs:
+        print(f"Warning: {len(orphans)} combination(s) in {RESULTS_JSONL.name} have no directory in {RESULTS_DIR.name}: "
+              + ", ".join(orphans))
+    
+    rows = {label: build_row(label, metrics) for label, metrics in by_label.items()}
+    for row in read_combo_rows(missing + stale):
+        rows[row["combo_id"]] = row
+    return [rows[label] for label in sorted(rows)]
 
 def main():
     parser = argparse.ArgumentParser(
@@ -41,47 +156,26 @@ def main():
         default=str(OUTPUT_CSV),
         help="Output CSV file path (default: dataset_results.csv)"
     )
+    parser.add_argument(
+        "--scan-dirs",
+        action="store_true",
+        help="Ignore dataset_results.jsonl and read every combo_*/metrics.json (the JSONL path already falls back per combo)"
+    )
     args = parser.parse_args()
     
-    if not RESULTS_DIR.exists():
-        print(f"Error: Results directory not found: {RESULTS_DIR}")
-        return 1
-    
-    # Find all combination directories
-    combo_dirs = sorted([d for d in RESULTS_DIR.iterdir() if d.is_dir() and d.name.startswith("combo_")])
-    
-    if not combo_dirs:
-        print(f"Error: No combination directories found in {RESULTS_DIR}")
-        return 1
-    
-    # Collect all results
-    results = []
-    for combo_dir in combo_dirs:
-        metrics = load_metrics(combo_dir)
-        if not metrics:
-            print(f"Warning: No metrics.json found in {combo_dir.name}")
-            continue
-        
-        # Extract AFL knob values
-        knobs_str = metrics.get("afl_knobs", "")
-        knobs = parse_afl_knobs(knobs_str)
+    if RESULTS_JSONL.exists() and not args.scan_dirs:
+        # Fast path: build_dataset.py appends every campaign's metrics to one file
+        print(f"Reading {RESULTS_JSONL.name}")
+        results = collect_from_jsonl()
+    else:
+        if not RESULTS_DIR.exists():
+            print(f"Error: Results directory not found: {RESULTS_DIR}")
+            return 1
         
-        # Build result row
-        row = {
-            "combo_id": combo_dir.name,
-            "AFL_FAST_CAL": knobs.get("AFL_FAST_CAL", "?"),
-            "AFL_NO_ARITH": knobs.get("AFL_NO_ARITH", "?"),
-            "AFL_NO_HAVOC": knobs.get("AFL_NO_HAVOC", "?"),
-            "AFL_DISABLE_TRIM": knobs.get("AFL_DISABLE_TRIM", "?"),
-            "AFL_SHUFFLE_QUEUE": knobs.get("AFL_SHUFFLE_QUEUE", "?"),
-            "bitmap_cvg_pct": metrics.get("bitmap_cvg_pct", 0),
-            "paths_total": metrics.get("paths_total", 0),
-            "execs_done": metrics.get("execs_done", 0),
-            "execs_per_sec": metrics.get("execs_per_sec", 0),
-            "bugs_triggered": metrics.get("bugs_triggered", 0),
-            "bugs_reached": metrics.get("bugs_reached", 0),
-        }
-        results.append(row)
+        results = collect_from_dirs()
+        if results is None:
+            print(f"Error: No combination directories found in {RESULTS_DIR}")
+            return 1
     
     # Write CSV
     if not results:
@@ -104,24 +198,26 @@ def main():
     ]
     
     output_path = Path(args.output)
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(results)
+    row_values = itemgetter(*fieldnames)
+    with open(output_path, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(row_values(r) for r in results)
     
     print(f"✓ Aggregated {len(results)} combinations")
     print(f"✓ Output: {output_path}")
     
     # Print summary statistics
     if results:
-        coverages = [r["bitmap_cvg_pct"] for r in results]
-        bugs = [r["bugs_triggered"] for r in results]
-        paths = [r["paths_total"] for r in results]
+        n = len(results)
+        coverages = np.fromiter((r["bitmap_cvg_pct"] for r in results), dtype=np.float64, count=n)
+        bugs = np.fromiter((r["bugs_triggered"] for r in results), dtype=np.int64, count=n)
+        paths = np.fromiter((r["paths_total"] for r in results), dtype=np.int64, count=n)
         
         print(f"\nSummary:")
-        print(f"  Coverage: min={min(coverages):.2f}%, max={max(coverages):.2f}%, avg={sum(coverages)/len(coverages):.2f}%")
-        print(f"  Bugs triggered: min={min(bugs)}, max={max(bugs)}, total={sum(bugs)}")
-        print(f"  Paths: min={min(paths)}, max={max(paths)}, avg={sum(paths)/len(paths):.0f}")
+        print(f"  Coverage: min={coverages.min():.2f}%, max={coverages.max():.2f}%, avg={coverages.mean():.2f}%")
+        print(f"  Bugs triggered: min={bugs.min()}, max={bugs.max()}, total={bugs.sum()}")
+        print(f"  Paths: min={paths.min()}, max={paths.max()}, avg={paths.mean():.0f}")
     
     return 0
 
@@ -5,30 +5,79 @@ Supports resuming from saved state for VCL disconnections.
 """
 
 import argparse
+import atexit
+import fcntl
 import itertools
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
+from queue import Empty, Queue
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
 PARAMS_FILE = SCRIPT_DIR / "afl_params.json"
 STATE_FILE = REPO_ROOT / "dataset_state.json"
+STATE_EVENTS_FILE = REPO_ROOT / "dataset_state.jsonl"
 RESULTS_DIR = REPO_ROOT / "dataset_results"
+RESULTS_JSONL = REPO_ROOT / "dataset_results.jsonl"
+CAMPAIGN_LOGS_DIR = REPO_ROOT / "dataset_logs"
 LOG_FILE = REPO_ROOT / "dataset_build.log"
 
+# Where captain leaves AFL's output under WORKDIR (cache/<fuzzer>/<target>/<program>/<run>/findings),
+# with and without AFL++'s per-instance "default" subdirectory
+FUZZER_STATS_GLOBS = (
+    "cache/*/*/*/*/findings/fuzzer_stats",
+    "cache/*/*/*/*/findings/*/fuzzer_stats",
+)
+
+# fuzzer_stats key -> (metrics.json field, converter); order matches metrics.json
+FUZZER_STATS_WANTED = {
+    "bitmap_cvg": ("bitmap_cvg_pct", lambda v: float(v.rstrip("%"))),
+    "paths_total": ("paths_total", int),
+    "execs_done": ("execs_done", int),
+    "execs_per_sec": ("execs_per_sec", float),
+}
+
+# One "key : value" pair per fuzzer_stats line (bytes pattern, so the file is scanned without decoding)
+_STATS_RE = re.compile(rb"^([a-z0-9_]+)[ \t]*:[ \t]*(\S+)", re.MULTILINE)
+
+def _json_loads(data):
+    """Decode JSON from bytes (orjson when available)."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj, indent=False):
+    """Encode obj as JSON bytes (orjson when available)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+_LOG_FH = None
+
+def _log_file():
+    """Return the shared line-buffered handle on LOG_FILE, opening it on first use."""
+    global _LOG_FH
+    if _LOG_FH is None:
+        _LOG_FH = open(LOG_FILE, "a", buffering=1)
+        atexit.register(_LOG_FH.close)
+    return _LOG_FH
+
 def log(msg):
     """Log message to both stdout and log file."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_msg = f"[{timestamp}] {msg}"
     print(log_msg)
-    with open(LOG_FILE, "a") as f:
-        f.write(log_msg + "\n")
+    _log_file().write(log_msg + "\n")
 
 def load_params():
     """Load AFL parameter definitions from JSON."""
@@ -40,36 +89,71 @@ def generate_combinations(params):
     param_names = list(params.keys())
     param_values = [params[name] for name in param_names]
     combinations = []
+    # Bit position of each parameter in the label: first parameter is the most significant bit
+    bit_positions = range(len(param_names) - 1, -1, -1)
     
     for combo in itertools.product(*param_values):
-        combo_dict = {name: val for name, val in zip(param_names, combo)}
+        combo_dict = dict(zip(param_names, combo))
         # Generate label: combo_0 through combo_31 based on binary encoding
-        binary_str = "".join(str(combo_dict[name]) for name in param_names)
-        combo_id = int(binary_str, 2)
+        combo_id = 0
+        for bit, val in zip(bit_positions, combo):
+            combo_id |= int(val) << bit
         label = f"combo_{combo_id}"
         combinations.append((label, combo_dict))
     
     return combinations
 
 def load_state():
-    """Load state file or create new one."""
-    if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            return json.load(f)
-    return {
-        "completed": [],
-        "in_progress": None,
+    """
+    Load state or create new one. STATE_FILE is a small header (start time, budget);
+    per-campaign progress is replayed from the append-only STATE_EVENTS_FILE.
+    """
+    state = {
         "start_time": datetime.now().isoformat(),
         "last_update": None,
         "total_combinations": 32,
         "time_budget_minutes": 20
     }
+    if STATE_FILE.exists():
+        state.update(_json_loads(STATE_FILE.read_bytes()))
+    # Older state files kept progress in the header; move it into the event log so it survives save_state()
+    legacy_completed = state.pop("completed", None) or []
+    legacy_in_progress = state.pop("in_progress", None) or []
+    if isinstance(legacy_in_progress, str):
+        legacy_in_progress = [legacy_in_progress]
+    for label in legacy_completed:
+        record_event("complete", label)
+    for label in legacy_in_progress:
+        record_event("start", label)
+    completed = set()
+    running = set()
+    if STATE_EVENTS_FILE.exists():
+        with open(STATE_EVENTS_FILE, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = _json_loads(line)
+                label = event["label"]
+                if event["event"] == "start":
+                    running.add(label)
+                else:
+                    running.discard(label)
+                    if event["event"] == "complete":
+                        completed.add(label)
+    state["completed"] = sorted(completed)
+    state["in_progress"] = sorted(running - completed)
+    return state
 
 def save_state(state):
-    """Save state file."""
+    """Save state header (progress lives in STATE_EVENTS_FILE, see record_event)."""
     state["last_update"] = datetime.now().isoformat()
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    header = {k: v for k, v in state.items() if k not in ("completed", "in_progress")}
+    STATE_FILE.write_bytes(_json_dumps(header))
+
+def record_event(event, label):
+    """Append a campaign event ("start", "complete" or "stop") to STATE_EVENTS_FILE."""
+    with open(STATE_EVENTS_FILE, "ab") as f:
+        f.write(_json_dumps({"event": event, "label": label, "ts": datetime.now().isoformat()}) + b"\n")
 
 def parse_timeout(timeout_str):
     """Parse timeout string (e.g., '20m', '1h') to seconds."""
@@ -82,20 +166,45 @@ def parse_timeout(timeout_str):
     else:
         return int(timeout_str) * 60  # Default to minutes
 
+_DOCKER_IMAGE_CACHED = None
+
 def check_docker_image():
-    """Check if Docker image exists. Returns True if it does. On permission error, returns False (caller should hint newgrp docker)."""
+    """
+    Check if Docker image exists. Returns True if it does. On permission error, returns False (caller should hint newgrp docker).
+    The answer is cached for the process; call invalidate_docker_cache() after building the image.
+    """
+    global _DOCKER_IMAGE_CACHED
+    if _DOCKER_IMAGE_CACHED is not None:
+        return _DOCKER_IMAGE_CACHED
     try:
+        # -q prints only image IDs (empty if missing); keep output as bytes, nothing needs decoding
         result = subprocess.run(
-            ["docker", "images", "magma/afl/libpng", "--format", "{{.Repository}}"],
+            ["docker", "images", "-q", "magma/afl/libpng"],
             capture_output=True,
-            text=True,
             timeout=5
         )
-        if result.returncode != 0 and "permission denied" in (result.stderr or "").lower():
-            return False  # Image may exist but we can't check
-        return "magma" in (result.stdout or "")
+        if result.returncode != 0 and b"permission denied" in result.stderr.lower():
+            _DOCKER_IMAGE_CACHED = False  # Image may exist but we can't check
+        else:
+            _DOCKER_IMAGE_CACHED = result.returncode == 0 and bool(result.stdout.strip())
     except Exception:
-        return False
+        _DOCKER_IMAGE_CACHED = False
+    return _DOCKER_IMAGE_CACHED
+
+def invalidate_docker_cache():
+    """Forget the cached check_docker_image() result."""
+    global _DOCKER_IMAGE_CACHED
+    _DOCKER_IMAGE_CACHED = None
+
+def read_tail(path, nbytes):
+    """Return the last nbytes of a file as text ("" if it is missing)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - nbytes))
+            return f.read().decode(errors="replace")
+    except OSError:
+        return ""
 
 def ensure_docker_image_built():
     """
@@ -110,66 +219,108 @@ def ensure_docker_image_built():
     if not prebuild.exists():
         log("ERROR: scripts/prebuild_image.sh not found")
         return False
+    stdout_path = REPO_ROOT / "prebuild.stdout.log"
+    stderr_path = REPO_ROOT / "prebuild.stderr.log"
     try:
-        result = subprocess.run(
-            [str(prebuild)],
-            cwd=str(REPO_ROOT),
-            env=os.environ.copy(),
-            timeout=None,  # No timeout - wait for full build
-            capture_output=True,
-            text=True
-        )
+        # Stream build output to files rather than holding it all in memory
+        with open(stdout_path, "wb") as out, open(stderr_path, "wb") as err:
+            result = subprocess.run(
+                [str(prebuild)],
+                cwd=str(REPO_ROOT),
+                env=os.environ.copy(),
+                timeout=None,  # No timeout - wait for full build
+                stdout=out,
+                stderr=err
+            )
         if result.returncode != 0:
-            log(f"Build failed with exit code {result.returncode}")
-            log(f"STDOUT: {result.stdout[-2000:]}")
-            log(f"STDERR: {result.stderr[-2000:]}")
-            if "permission denied" in (result.stderr or "").lower() or "docker.sock" in (result.stderr or ""):
+            stderr_tail = read_tail(stderr_path, 2000)
+            log(f"Build failed with exit code {result.returncode} (full output: {stdout_path.name}, {stderr_path.name})")
+            log(f"STDOUT: {read_tail(stdout_path, 2000)}")
+            log(f"STDERR: {stderr_tail}")
+            if "permission denied" in stderr_tail.lower() or "docker.sock" in stderr_tail:
                 log("  → Fix: add your user to the 'docker' group: sudo usermod -aG docker $USER")
                 log("  → Then log out and back in, or run: newgrp docker")
             return False
+        invalidate_docker_cache()
         log("Docker image built successfully. Starting campaigns with time budget only.")
         return True
     except Exception as e:
         log(f"Build failed: {e}")
         return False
 
+def find_fuzzer_stats(workdir):
+    """Return the first fuzzer_stats under workdir, or None. Tries captain's known layouts before walking."""
+    for pattern in FUZZER_STATS_GLOBS:
+        for candidate in workdir.glob(pattern):
+            return candidate
+    # Fallback: breadth-first walk that stops at the first hit
+    pending = [str(workdir)]
+    while pending:
+        next_level = []
+        for path in pending:
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            next_level.append(entry.path)
+                        elif entry.name == "fuzzer_stats":
+                            return Path(entry.path)
+            except OSError:
+                continue
+        pending = next_level
+    return None
+
+def read_fuzzer_stats(stats_file):
+    """Return fuzzer_stats as a {key: value} dict of strings."""
+    # One read, not mmap: AFL may truncate the file mid-scan, which faults (SIGBUS) on a mapping
+    data = Path(stats_file).read_bytes()
+    return {k.decode(): v.decode(errors="replace") for k, v in _STATS_RE.findall(data)}
+
+def append_results_jsonl(metrics):
+    """Append one campaign's metrics as a line of RESULTS_JSONL (read by aggregate_results.py)."""
+    # recorded_at lets the aggregator tell whether metrics.json was rewritten after this line
+    record = {**metrics, "recorded_at": time.time()}
+    with open(RESULTS_JSONL, "ab") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.write(_json_dumps(record) + b"\n")
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
 def extract_metrics_from_workdir(workdir, results_dir, label):
     """Extract fuzzer_stats from workdir and write metrics.json for label (e.g. after timeout)."""
     workdir = Path(workdir)
     results_dir = Path(results_dir)
-    stats_files = list(workdir.rglob("fuzzer_stats"))
-    if not stats_files:
+    stats_file = find_fuzzer_stats(workdir)
+    if stats_file is None:
         return
-    stats_file = stats_files[0]
-    text = stats_file.read_text()
-    def get(key, default="0"):
-        m = re.search(rf"{key}\s*:\s*(\S+)", text)
-        return m.group(1) if m else default
-    coverage = get("bitmap_cvg", "0")
-    paths_total = get("paths_total", "0")
-    execs_done = get("execs_done", "0")
-    execs_per_sec = get("execs_per_sec", "0")
+    fields = read_fuzzer_stats(stats_file)
     out_dir = results_dir / label
     out_dir.mkdir(parents=True, exist_ok=True)
-    metrics = {
-        "label": label,
-        "bitmap_cvg_pct": float(coverage),
-        "paths_total": int(paths_total),
-        "execs_done": int(execs_done),
-        "execs_per_sec": float(execs_per_sec),
-        "bugs_triggered": 0,
-        "bugs_reached": 0,
-    }
-    (out_dir / "metrics.json").write_text(json.dumps(metrics, indent=2))
+    metrics = {"label": label}
+    for key, (name, convert) in FUZZER_STATS_WANTED.items():
+        try:
+            metrics[name] = convert(fields.get(key, "0"))
+        except ValueError:
+            metrics[name] = convert("0")
+    metrics["bugs_triggered"] = 0
+    metrics["bugs_reached"] = 0
+    (out_dir / "metrics.json").write_bytes(_json_dumps(metrics, indent=True))
+    append_results_jsonl(metrics)
     try:
+        # Copy, not link: after a timeout AFL may still be writing, so keep a snapshot
         import shutil
         shutil.copy(stats_file, out_dir / "fuzzer_stats")
     except Exception:
         pass
 
-def run_campaign(label, params, timeout_seconds, captainrc):
-    """Run a single fuzzing campaign with given parameters."""
-    log(f"Starting campaign: {label}")
+def run_campaign(label, params, timeout_seconds, captainrc, workdir=None, cpu=None):
+    """
+    Run a single fuzzing campaign with given parameters.
+    workdir/cpu give a concurrent campaign its own captain WORKDIR and core (default: REPO_ROOT/workdir, unpinned).
+    """
+    workdir = Path(workdir) if workdir else REPO_ROOT / "workdir"
+    log(f"Starting campaign: {label}" + (f" (cpu {cpu})" if cpu is not None else ""))
     log(f"Parameters: {params}")
     
     # Build is done separately. Here we only need fuzz budget + small buffer for start/stop.
@@ -188,6 +339,10 @@ def run_campaign(label, params, timeout_seconds, captainrc):
     env["AFL_NO_AFFINITY"] = "1"
     env["AFL_I_DONT_CARE_ABOUT_MISSING_CRASHES"] = "1"
     env["AFL_NO_UI"] = "1"
+    env["WORKDIR"] = str(workdir)
+    if cpu is not None:
+        # Captain hands each campaign a core from WORKER_POOL and starts its container with --cpuset-cpus
+        env["WORKER_POOL"] = str(cpu)
     
     # Run the campaign script
     cmd = [
@@ -197,40 +352,46 @@ def run_campaign(label, params, timeout_seconds, captainrc):
         str(RESULTS_DIR)
     ]
     
+    # Campaign output goes to files, so the parent's memory stays flat over 20 minutes. They live outside
+    # RESULTS_DIR so a failed campaign doesn't leave a combo_* dir without metrics.json behind
+    CAMPAIGN_LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    stdout_path = CAMPAIGN_LOGS_DIR / f"{label}.stdout.log"
+    stderr_path = CAMPAIGN_LOGS_DIR / f"{label}.stderr.log"
+    
     start_time = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=str(REPO_ROOT),
-            env=env,
-            timeout=effective_timeout,
-            capture_output=True,
-            text=True
-        )
+        with open(stdout_path, "wb") as out, open(stderr_path, "wb") as err:
+            result = subprocess.run(
+                cmd,
+                cwd=str(REPO_ROOT),
+                env=env,
+                timeout=effective_timeout,
+                stdout=out,
+                stderr=err
+            )
         elapsed = time.time() - start_time
         
         if result.returncode != 0:
             log(f"Campaign {label} failed with return code {result.returncode}")
-            log(f"STDOUT: {result.stdout[-1000:]}")
-            log(f"STDERR: {result.stderr[-1000:]}")
+            log(f"STDOUT: {read_tail(stdout_path, 1000)}")
+            log(f"STDERR: {read_tail(stderr_path, 1000)}")
             return (False, None)
         
         # Check if campaign actually ran (should take more than a few seconds)
         if elapsed < 5:
             log(f"WARNING: Campaign {label} completed too quickly ({elapsed:.1f}s)")
             log(f"This likely indicates captain failed or didn't run properly")
-            log(f"STDOUT: {result.stdout[-1000:]}")
-            log(f"STDERR: {result.stderr[-1000:]}")
+            log(f"STDOUT: {read_tail(stdout_path, 1000)}")
+            log(f"STDERR: {read_tail(stderr_path, 1000)}")
             return (False, None)
         
         log(f"Campaign {label} completed in {elapsed:.1f}s")
-        return (True, (result.stdout or "")[-4000:] + "\n--- STDERR ---\n" + (result.stderr or "")[-4000:])
+        return (True, read_tail(stdout_path, 4000) + "\n--- STDERR ---\n" + read_tail(stderr_path, 4000))
         
     except subprocess.TimeoutExpired:
         elapsed = time.time() - start_time
         log(f"Campaign {label} timed out after {elapsed:.1f}s")
         # Try to extract partial metrics from workdir (in case fuzzer was running)
-        workdir = REPO_ROOT / "workdir"
         if workdir.exists():
             try:
                 extract_metrics_from_workdir(workdir, RESULTS_DIR, label)
@@ -248,9 +409,16 @@ def run_campaign(label, params, timeout_seconds, captainrc):
                                 log(f"  {line}")
                         except Exception:
                             pass
-        log(f"  Check workdir/log/ for build/fuzzing logs")
+        log(f"  Check {workdir / 'log'}/ for build/fuzzing logs")
         return (False, None)
 
+def record_combo_results(label):
+    """Append label's metrics.json to RESULTS_JSONL; failures are logged, not raised."""
+    try:
+        append_results_jsonl(_json_loads((RESULTS_DIR / label / "metrics.json").read_bytes()))
+    except Exception as e:
+        log(f"  (could not append {label} to {RESULTS_JSONL.name}: {e})")
+
 def check_combo_complete(label):
     """Check if a combination has valid results."""
     combo_dir = RESULTS_DIR / label
@@ -260,8 +428,7 @@ def check_combo_complete(label):
     
     # Check if metrics show actual fuzzing happened (not just build failure)
     try:
-        with open(metrics_file) as f:
-            metrics = json.load(f)
+        metrics = _json_loads(metrics_file.read_bytes())
         # If execs_done is 0, fuzzing didn't happen
         execs_done = metrics.get("execs_done", 0)
         if execs_done == 0:
@@ -306,8 +473,18 @@ def main():
         action="store_true",
         help="Skip Docker image build phase (use if image already exists)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of campaigns to run concurrently; with N > 1 each gets its own workdir-<slot>/ and is pinned to its own CPU core (default: 1)"
+    )
     args = parser.parse_args()
     
+    cpus = sorted(os.sched_getaffinity(0))
+    if args.jobs < 1 or args.jobs > len(cpus):
+        parser.error(f"--jobs must be between 1 and {len(cpus)} (available CPU cores)")
+    
     # Parse timeout
     timeout_seconds = parse_timeout(args.budget)
     
@@ -346,61 +523,81 @@ def main():
             sys.exit(1)
     
     # Handle resume logic
-    completed_set = set(state.get("completed", []))
-    in_progress = state.get("in_progress")
+    completed_set = set(state["completed"])
     
-    if in_progress and in_progress not in completed_set:
-        log(f"Found in-progress combination: {in_progress}")
-        if check_combo_complete(in_progress):
-            log(f"Combination {in_progress} has valid results, marking complete")
-            completed_set.add(in_progress)
-            state["completed"] = list(completed_set)
-            state["in_progress"] = None
-            save_state(state)
-        else:
-            log(f"Restarting combination: {in_progress}")
-    
-    # Run each combination
-    for label, combo_params in combinations:
-        if label in completed_set:
-            log(f"Skipping completed combination: {label}")
-            continue
-        
-        # Update state
-        state["in_progress"] = label
-        save_state(state)
-        
-        # Run campaign
-        run_result = run_campaign(label, combo_params, timeout_seconds, args.captainrc)
-        success = run_result[0] if isinstance(run_result, tuple) else run_result
-        campaign_output = run_result[1] if isinstance(run_result, tuple) and len(run_result) > 1 else None
-        
-        # Check if combo completed successfully
-        is_complete = check_combo_complete(label)
-        
-        if success and is_complete:
+    for label in state["in_progress"]:
+        log(f"Found in-progress combination: {label}")
+        if check_combo_complete(label):
+            log(f"Combination {label} has valid results, marking complete")
+            record_combo_results(label)
             completed_set.add(label)
-            state["completed"] = list(completed_set)
-            state["in_progress"] = None
-            save_state(state)
-            log(f"✓ Completed: {label} ({len(completed_set)}/{len(combinations)})")
+            record_event("complete", label)
         else:
-            if success:
-                log(f"✗ Incomplete: {label} (fuzzing didn't run or produced no results)")
-                if campaign_output:
-                    log(f"  --- Last campaign output (for diagnosis) ---")
-                    for line in campaign_output.strip().split("\n")[-80:]:
-                        log(f"  {line}")
-                log(f"  Run manually to see live output: ./scripts/run_knob_campaign.sh {label} 2>&1 | tee {label}.log")
+            log(f"Restarting combination: {label}")
+    
+    # Run each combination; --jobs workers pull from a shared queue, each with its own workdir and core
+    remaining = [(label, combo_params) for label, combo_params in combinations if label not in completed_set]
+    if completed_set:
+        log(f"Resuming: {len(remaining)} of {len(combinations)} combinations pending")
+    pending = Queue()
+    for item in remaining:
+        pending.put(item)
+    
+    state_lock = threading.Lock()
+    
+    def update_state(label, started, done=False):
+        """Record a campaign starting or finishing; workers share state, so serialize under state_lock."""
+        with state_lock:
+            if done:
+                completed_set.add(label)
+            record_event("start" if started else "complete" if done else "stop", label)
+    
+    def worker(slot):
+        workdir = REPO_ROOT / ("workdir" if args.jobs == 1 else f"workdir-{slot}")
+        cpu = cpus[slot] if args.jobs > 1 else None
+        while True:
+            try:
+                label, combo_params = pending.get_nowait()
+            except Empty:
+                return
+            
+            # Update state
+            update_state(label, started=True)
+            
+            # Run campaign
+            run_result = run_campaign(label, combo_params, timeout_seconds, args.captainrc, workdir, cpu)
+            success = run_result[0] if isinstance(run_result, tuple) else run_result
+            campaign_output = run_result[1] if isinstance(run_result, tuple) and len(run_result) > 1 else None
+            
+            # Check if combo completed successfully
+            is_complete = check_combo_complete(label)
+            
+            if success and is_complete:
+                record_combo_results(label)
+                update_state(label, started=False, done=True)
+                log(f"✓ Completed: {label} ({len(completed_set)}/{len(combinations)})")
             else:
-                log(f"✗ Failed: {label} (check logs for details)")
-            # Clear in_progress so we don't get stuck retrying the same failing combo
-            # User can manually investigate and fix the issue
-            state["in_progress"] = None
-            save_state(state)
-        
-        # Brief pause between campaigns
-        time.sleep(2)
+                if success:
+                    log(f"✗ Incomplete: {label} (fuzzing didn't run or produced no results)")
+                    if campaign_output:
+                        log(f"  --- Last campaign output (for diagnosis) ---")
+                        for line in campaign_output.strip().split("\n")[-80:]:
+                            log(f"  {line}")
+                    log(f"  Run manually to see live output: ./scripts/run_knob_campaign.sh {label} 2>&1 | tee {label}.log")
+                else:
+                    log(f"✗ Failed: {label} (check logs for details)")
+                # Clear in_progress so we don't get stuck retrying the same failing combo
+                # User can manually investigate and fix the issue
+                update_state(label, started=False)
+            
+            # Brief pause between campaigns
+            time.sleep(2)
+    
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(args.jobs)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
     
     # Final summary
     log(f"\n{'='*60}")
@@ -11,57 +11,85 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Fuzzer/target/program the dataset campaigns run (also hardcoded in run_knob_campaign.sh's bug count)
+DEFAULT_FUZZER = "afl"
+DEFAULT_TARGET = "libpng"
+DEFAULT_PROGRAM = "libpng_read_fuzzer"
+
 def load_bugs_json(path):
     with open(path) as f:
         data = json.load(f)
     return data.get("results", data)
 
-def collect_runs(results, fuzzer="afl", target="libpng", program="libpng_read_fuzzer"):
-    """Yield (run_id, triggered_dict, reached_dict) for each run."""
-    try:
-        by_program = results[fuzzer][target][program]
-    except KeyError:
-        return
+def load_program_runs(path, fuzzer=DEFAULT_FUZZER, target=DEFAULT_TARGET, program=DEFAULT_PROGRAM):
+    """
+    Return {run_id: run_data} for one fuzzer/target/program from bugs.json.
+    With ijson installed only that subtree is parsed; otherwise the whole file is loaded.
+    """
+    if ijson is None:
+        try:
+            return load_bugs_json(path)[fuzzer][target][program]
+        except KeyError:
+            return {}
+    # bugs.json normally nests everything under "results"; accept a bare results dict too
+    for prefix in (f"results.{fuzzer}.{target}.{program}", f"{fuzzer}.{target}.{program}"):
+        with open(path, "rb") as f:
+            runs = dict(ijson.kvitems(f, prefix))
+        if runs:
+            return runs
+    return {}
+
+def iter_program_runs(by_program):
+    """Yield (run_id, triggered_dict, reached_dict) for each run of one program."""
     for run_id, run_data in by_program.items():
         triggered = run_data.get("triggered") or {}
         reached = run_data.get("reached") or {}
         yield run_id, triggered, reached
 
-def aggregate_trigger_times(runs_data):
-    """From list of (run_id, triggered_dict), return bug_id -> list of first-trigger times (sec)."""
+def cumulative_bugs_curve(triggered_dict, poll_resolution=5):
+    """From one run's triggered dict (bug_id -> first trigger time in sec), return (times, counts) arrays."""
+    times = np.fromiter((int(t) for t in triggered_dict.values()), dtype=np.int64, count=len(triggered_dict))
+    if times.size == 0:
+        return np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+    times.sort()
+    # At each first-trigger time T, cumulative count goes up by 1
+    return np.concatenate(([0], times)), np.arange(times.size + 1)
+
+def build_bug_stats(runs_data):
+    """
+    Single pass over (run_id, triggered_dict, reached_dict) tuples. Returns (by_bug, run_curves):
+    by_bug maps bug_id -> int64 array of first-trigger times (sec) across runs,
+    run_curves is a list of (run_id, times, counts) from cumulative_bugs_curve.
+    """
     from collections import defaultdict
     by_bug = defaultdict(list)
-    for _run_id, triggered, _reached in runs_data:
+    run_curves = []
+    for run_id, triggered, _reached in runs_data:
         for bug_id, t in triggered.items():
             by_bug[bug_id].append(int(t))
-    return dict(by_bug)
-
-def cumulative_bugs_curve(triggered_dict, poll_resolution=5):
-    """From one run's triggered dict (bug_id -> first trigger time in sec), return (times, counts)."""
-    if not triggered_dict:
-        return [0], [0]
-    times_sorted = sorted(triggered_dict.values())
-    # At each first-trigger time T, cumulative count goes up by 1
-    out_t = [0]
-    out_c = [0]
-    for t in times_sorted:
-        out_t.append(t)
-        out_c.append(out_c[-1] + 1)
-    return out_t, out_c
+        run_curves.append((run_id, *cumulative_bugs_curve(triggered)))
+    return {b: np.asarray(ts, dtype=np.int64) for b, ts in by_bug.items()}, run_curves
 
 def main():
     ap = argparse.ArgumentParser(description="Plot benchmark graphs from bugs.json")
     ap.add_argument("bugs_json", help="Path to bugs.json (output of exp2json)")
     ap.add_argument("-o", "--output-dir", default=".", help="Directory for output PNGs and summary CSV")
-    ap.add_argument("--fuzzer", default="afl", help="Fuzzer name in results")
-    ap.add_argument("--target", default="libpng", help="Target name")
-    ap.add_argument("--program", default="libpng_read_fuzzer", help="Program name")
+    ap.add_argument("--fuzzer", default=DEFAULT_FUZZER, help="Fuzzer name in results")
+    ap.add_argument("--target", default=DEFAULT_TARGET, help="Target name")
+    ap.add_argument("--program", default=DEFAULT_PROGRAM, help="Program name")
     args = ap.parse_args()
 
     try:
-        import matplotlib
-        matplotlib.use("Agg")
-        import matplotlib.pyplot as plt
+        # Agg canvas + Figure directly: no pyplot state or interactive backend probing, we only write PNGs
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
     except ImportError:
         print("matplotlib is required: pip install matplotlib", file=sys.stderr)
         sys.exit(1)
@@ -71,8 +99,7 @@ def main():
         print(f"File not found: {path}", file=sys.stderr)
         sys.exit(1)
 
-    results = load_bugs_json(path)
-    runs_data = list(collect_runs(results, args.fuzzer, args.target, args.program))
+    runs_data = list(iter_program_runs(load_program_runs(path, args.fuzzer, args.target, args.program)))
     if not runs_data:
         print(f"No runs found for {args.fuzzer}/{args.target}/{args.program}", file=sys.stderr)
         sys.exit(1)
@@ -80,56 +107,66 @@ def main():
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    by_bug, run_curves = build_bug_stats(runs_data)
+    # Per-bug reductions over the trigger-time arrays, shared by the bar chart, CSV and JSON.
+    # Median is the upper middle element (same as sorted(t)[len(t) // 2]), found by O(n) selection.
+    mins = {b: int(a.min()) for b, a in by_bug.items()}
+    medians = {b: int(np.partition(a, a.size // 2)[a.size // 2]) for b, a in by_bug.items()}
+
     # --- Per-bug time to first trigger (aggregate: min across runs) ---
-    by_bug = aggregate_trigger_times(runs_data)
     if not by_bug:
         print("No triggered bugs in any run.", file=sys.stderr)
     else:
         bug_ids = sorted(by_bug.keys())
         # Use minimum time across runs as "time to first trigger" for that bug
-        times = [min(by_bug[b]) for b in bug_ids]
-        fig, ax = plt.subplots(figsize=(max(8, len(bug_ids) * 0.4), 5))
+        times = [mins[b] for b in bug_ids]
+        fig = Figure(figsize=(max(8, len(bug_ids) * 0.4), 5))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
         ax.bar(range(len(bug_ids)), [t / 60 for t in times], tick_label=bug_ids, color="steelblue", edgecolor="navy")
         ax.set_xlabel("Bug ID")
         ax.set_ylabel("Time to first trigger (minutes)")
         ax.set_title("Time to first trigger per bug (min across runs)")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
+        for tick in ax.get_xticklabels():
+            tick.set_rotation(45)
+            tick.set_ha("right")
+        fig.tight_layout()
         fig.savefig(out_dir / "benchmark_time_to_first_bug.png", dpi=150)
-        plt.close(fig)
         print(f"Wrote {out_dir / 'benchmark_time_to_first_bug.png'}")
 
     # --- Cumulative bugs over time (one curve per run, or median) ---
-    fig, ax = plt.subplots(figsize=(8, 5))
-    for run_id, triggered, _ in runs_data:
-        t_vals, c_vals = cumulative_bugs_curve(triggered)
+    fig = Figure(figsize=(8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    for run_id, t_vals, c_vals in run_curves:
         ax.step(t_vals, c_vals, where="post", alpha=0.7, label=f"Run {run_id}")
     ax.set_xlabel("Time (seconds from campaign start)")
     ax.set_ylabel("Cumulative bugs triggered")
     ax.set_title("Bugs triggered over time")
     ax.legend()
     ax.grid(True, alpha=0.3)
-    plt.tight_layout()
+    fig.tight_layout()
     fig.savefig(out_dir / "benchmark_bugs_over_time.png", dpi=150)
-    plt.close(fig)
     print(f"Wrote {out_dir / 'benchmark_bugs_over_time.png'}")
 
     # --- Summary table (CSV) ---
-    summary_rows = []
-    for bug_id in sorted(by_bug.keys()):
-        trigger_times = by_bug[bug_id]
-        summary_rows.append({
-            "bug_id": bug_id,
-            "time_to_first_trigger_sec_min": min(trigger_times),
-            "time_to_first_trigger_sec_median": sorted(trigger_times)[len(trigger_times) // 2] if trigger_times else None,
-            "runs_triggered": len(trigger_times),
-        })
+    summary_fields = ["bug_id", "time_to_first_trigger_sec_min", "time_to_first_trigger_sec_median", "runs_triggered"]
+    # Rows are tuples in summary_fields order
+    summary_rows = [
+        (
+            bug_id,
+            mins[bug_id],
+            medians[bug_id],
+            by_bug[bug_id].size,
+        )
+        for bug_id in sorted(by_bug)
+    ]
     csv_path = out_dir / "benchmark_summary.csv"
     if summary_rows:
         import csv as csv_module
         with open(csv_path, "w", newline="") as f:
-            w = csv_module.DictWriter(f, fieldnames=["bug_id", "time_to_first_trigger_sec_min", "time_to_first_trigger_sec_median", "runs_triggered"])
-            w.writeheader()
+            w = csv_module.writer(f)
+            w.writerow(summary_fields)
             w.writerows(summary_rows)
         print(f"Wrote {csv_path}")
 
@@ -140,7 +177,7 @@ def main():
         "target": args.target,
         "program": args.program,
         "num_runs": len(runs_data),
-        "per_bug_min_trigger_sec": {b: min(times) for b, times in by_bug.items()} if by_bug else {},
+        "per_bug_min_trigger_sec": mins,
     }
     json_path = out_dir / "benchmark_summary.json"
     with open(json_path, "w") as f:
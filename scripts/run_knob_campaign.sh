@@ -115,12 +115,31 @@ BUGS_JSON="$RUN_OUTPUT/bugs.json"
 python3 "$MAGMA/tools/benchd/exp2json.py" "$WORKDIR" "$BUGS_JSON" 2>/dev/null || true
 
 # Extract coverage from fuzzer_stats (AFL writes into findings; captain may put it in workdir/ar/.../ball.tar)
-FUZZER_STATS=$(find "$WORKDIR" -name "fuzzer_stats" -type f 2>/dev/null | head -1)
+# Try captain's layout (cache/<fuzzer>/<target>/<program>/<run>/findings[/default]) before searching the whole workdir
+FUZZER_STATS=""
+for f in "$WORKDIR"/cache/*/*/*/*/findings/fuzzer_stats "$WORKDIR"/cache/*/*/*/*/findings/*/fuzzer_stats; do
+    if [ -f "$f" ]; then
+        FUZZER_STATS="$f"
+        break
+    fi
+done
+if [ -z "$FUZZER_STATS" ]; then
+    FUZZER_STATS=$(find "$WORKDIR" -name "fuzzer_stats" -type f 2>/dev/null | head -1)
+fi
 EXTRACT_DIR=""
 
 # If not found, captain may have archived output in ball.tar - extract and look inside
 if [ -z "$FUZZER_STATS" ]; then
-    BALL_TAR=$(find "$WORKDIR" -name "ball.tar" -type f 2>/dev/null | head -1)
+    BALL_TAR=""
+    for f in "$WORKDIR"/ar/*/*/*/*/ball.tar; do
+        if [ -f "$f" ]; then
+            BALL_TAR="$f"
+            break
+        fi
+    done
+    if [ -z "$BALL_TAR" ]; then
+        BALL_TAR=$(find "$WORKDIR" -name "ball.tar" -type f 2>/dev/null | head -1)
+    fi
     if [ -n "$BALL_TAR" ]; then
         EXTRACT_DIR=$(mktemp -d)
         if tar -xf "$BALL_TAR" -C "$EXTRACT_DIR" 2>/dev/null; then
@@ -154,34 +173,18 @@ if [ -z "$FUZZER_STATS" ]; then
     done 2>/dev/null || true
 fi
 
-# Count bugs from bugs.json
+# Count bugs from bugs.json (one parse; the dataset always runs afl/libpng/libpng_read_fuzzer,
+# same defaults as scripts/plot_benchmark.py)
 BUGS_TRIGGERED=0
 BUGS_REACHED=0
 if [ -f "$BUGS_JSON" ]; then
-    BUGS_TRIGGERED=$(python3 -c "
-import json
-d = json.load(open('$BUGS_JSON'))
-r = d.get('results',{})
-count = 0
-for f in r.values():
-  for t in f.values():
-    for p in t.values():
-      for run in p.values():
-        count += len(run.get('triggered',{}))
-print(count)
-" 2>/dev/null || echo "0")
-    BUGS_REACHED=$(python3 -c "
-import json
-d = json.load(open('$BUGS_JSON'))
-r = d.get('results',{})
-count = 0
-for f in r.values():
-  for t in f.values():
-    for p in t.values():
-      for run in p.values():
-        count += len(run.get('reached',{}))
-print(count)
-" 2>/dev/null || echo "0")
+    read -r BUGS_TRIGGERED BUGS_REACHED < <(python3 -c "
+import json, sys
+d = json.load(open(sys.argv[1]))
+runs = d.get('results', {}).get('afl', {}).get('libpng', {}).get('libpng_read_fuzzer', {})
+print(sum(len(r.get('triggered') or {}) for r in runs.values()),
+      sum(len(r.get('reached') or {}) for r in runs.values()))
+" "$BUGS_JSON" 2>/dev/null || echo "0 0")
 fi
 
 # Collect AFL knob settings